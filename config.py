@@ -4,69 +4,92 @@ Environment-based configuration for Flask app
 """
 
 import os
+import logging
 from datetime import timedelta
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from settings import settings
+
+# Split a 20-connection budget across gunicorn workers; each worker keeps half of its
+# share open and may burst to the rest, so pool_size + max_overflow stays within it
+# (beyond 10 workers the two-connection floor per worker takes over)
+_MAX_CONNECTIONS = 20
+_WORKER_CONNECTIONS = max(2, _MAX_CONNECTIONS // settings.web_concurrency)
+_POOL_SIZE = _WORKER_CONNECTIONS // 2
+
+_BASEDIR = os.path.abspath(os.path.dirname(__file__))
+_SQLITE_PATH = os.path.join(_BASEDIR, "data", "finance.db")
 
 class Config:
     """Base configuration class"""
     
     # Basic Flask settings
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = settings.secret_key or 'dev-secret-key-change-in-production'
     
     # Database configuration - Use DATABASE_URL directly
-    database_url = os.environ.get('DATABASE_URL', '').strip()
-    
-    if database_url and database_url.startswith(('postgres://', 'postgresql://')):
+    if settings.is_postgres:
         # Production: Use the provided DATABASE_URL
-        SQLALCHEMY_DATABASE_URI = database_url
-        
-        # Extract hostname for display (fix the parsing)
-        try:
-            if '@' in database_url:
-                hostname_part = database_url.split('@')[1].split('/')[0]
-                print(f"Using PostgreSQL database: {hostname_part}")
-            else:
-                print("Using PostgreSQL database")
-        except:
-            print("Using PostgreSQL database")
+        SQLALCHEMY_DATABASE_URI = settings.database_url
     else:
         # Development: Use SQLite
-        basedir = os.path.abspath(os.path.dirname(__file__))
-        sqlite_path = os.path.join(basedir, "data", "finance.db")
-        SQLALCHEMY_DATABASE_URI = f'sqlite:///{sqlite_path}'
-        print(f"Using SQLite database: {SQLALCHEMY_DATABASE_URI}")
-        
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(sqlite_path), exist_ok=True)
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{_SQLITE_PATH}'
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 300,
-        'pool_size': 10,
-        'max_overflow': 20
+        'pool_size': _POOL_SIZE,
+        'max_overflow': _WORKER_CONNECTIONS - _POOL_SIZE,
+        'pool_timeout': 5
     }
     
+    if settings.is_postgres:
+        # Cancel slow statements before they tie up pooled connections
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {'options': '-c statement_timeout=5000'}
+    
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
-    SESSION_COOKIE_SECURE = os.environ.get('FLASK_ENV') == 'production'
+    SESSION_COOKIE_SECURE = settings.flask_env == 'production'
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     
+    # Server-side session store (signed cookies are used when unset)
+    REDIS_URL = settings.redis_url
+    
+    # Password hashing (werkzeug method string)
+    PASSWORD_HASH_METHOD = 'scrypt'
+    
     # Security headers
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
     
     # Application settings
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    MAX_CONTENT_LENGTH = 64 * 1024  # 64KB max request body (JSON only, no uploads)
     JSON_SORT_KEYS = False
+    SUMMARY_CACHE_TIMEOUT = 30  # seconds a per-user summary may be reused
     
     # Logging
-    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_LEVEL = settings.log_level
     
     @staticmethod
     def init_app(app):
         """Initialize application with this config"""
-        pass
+        database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+        
+        if database_uri.startswith(('postgres://', 'postgresql://')):
+            # Extract hostname for display
+            hostname = urlsplit(database_uri).hostname
+            if hostname:
+                logging.info(f"Using PostgreSQL database: {hostname}")
+            else:
+                logging.info("Using PostgreSQL database")
+        else:
+            logging.info(f"Using SQLite database: {database_uri}")
+            
+            # Ensure data directory exists
+            if database_uri == f'sqlite:///{_SQLITE_PATH}':
+                os.makedirs(os.path.dirname(_SQLITE_PATH), exist_ok=True)
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -82,7 +105,10 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # In-memory SQLite uses a StaticPool, which rejects the pool sizing options
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
 
 # Configuration mapping
 config = {
@@ -91,3 +117,8 @@ config = {
     'testing': TestingConfig,
     'default': DevelopmentConfig
 }
+
+@lru_cache(maxsize=4)
+def get_config(config_name=None):
+    """Resolve a configuration class by name, defaulting to FLASK_ENV"""
+    return config.get(config_name or settings.flask_env or 'default', config['default'])
@@ -4,89 +4,348 @@ Flask application with RESTful API endpoints
 """
 
 import os
+import atexit
+import hashlib
 import logging
-from datetime import datetime
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+import orjson
 from flask import Flask, render_template, request, jsonify, session
-from flask_sqlalchemy import SQLAlchemy
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.security import generate_password_hash, check_password_hash
-from functools import wraps
-from sqlalchemy import text
+from functools import lru_cache, wraps
+from sqlalchemy import Integer, cast, delete, event, extract, func, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import postgresql, sqlite
 
-from model import db, User, Expense, Category
-from config import Config
+from model import db, User, Expense, Category, MonthlySpending, ExpenseVersion, ExpenseRow
+from config import get_config
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses and parses request bodies with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Initialize Flask app
 app = Flask(__name__)
-app.config.from_object(Config)
+app.json = ORJSONProvider(app)
+config_class = get_config()
+app.config.from_object(config_class)
 
 # Initialize database
 db.init_app(app)
 
-# Setup logging
+# Keep session state in Redis when configured so the cookie only carries a session id
+if app.config.get('REDIS_URL'):
+    import redis
+    from flask_session import Session
+    
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(app.config['REDIS_URL'])
+    Session(app)
+
+# Setup logging: request threads only enqueue records, a listener thread does the I/O
+_log_formatter = logging.Formatter('%(asctime)s %(levelname)s: %(message)s')
+_log_handlers = [
+    RotatingFileHandler('logs/app.log', maxBytes=10 * 1024 * 1024, backupCount=5),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s: %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
+    level=app.config.get('LOG_LEVEL', 'INFO'),
+    format='%(message)s',
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Apply config-specific setup once logging is in place
+config_class.init_app(app)
+
+# Slow SELECTs get their query plan logged in debug mode to catch missed indexes
+SLOW_QUERY_SECONDS = 0.05
+_EXPLAIN_PREFIXES = {'postgresql': 'EXPLAIN ', 'sqlite': 'EXPLAIN QUERY PLAN '}
+
+if app.debug:
+    # The start time lives on the execution context, so statements that raise
+    # (and never reach after_cursor_execute) leave nothing behind
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def explain_slow_query(conn, cursor, statement, parameters, context, executemany):
+        """Log the plan of SELECTs slower than SLOW_QUERY_SECONDS"""
+        started = getattr(context, '_query_start', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if elapsed < SLOW_QUERY_SECONDS or prefix is None or executemany:
+            return
+        if not statement.lstrip().upper().startswith('SELECT'):
+            return
+
+        # A separate cursor keeps the original result set intact
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            plan = '\n'.join(' '.join(str(col) for col in row) for row in explain_cursor.fetchall())
+        except Exception as e:
+            plan = f'unavailable ({e})'
+        finally:
+            explain_cursor.close()
+        logging.warning(f"Slow query ({elapsed * 1000:.0f} ms): {statement}\n{plan}")
+
+# Dialect-specific INSERT constructs that support ON CONFLICT clauses
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+@lru_cache(maxsize=1)
+def upsert_insert():
+    """Resolve the ON CONFLICT-capable insert() once; the engine's dialect is fixed per process"""
+    return _UPSERT_INSERTS.get(db.engine.dialect.name)
+
+# Categories seeded into an empty database
+DEFAULT_CATEGORIES = (
+    'Food & Dining', 'Transportation', 'Shopping', 'Entertainment',
+    'Bills & Utilities', 'Health & Fitness', 'Travel', 'Education',
+    'Personal Care', 'Other'
+)
+
+# Categories are only created by init_database, so their JSON payload is cached per process
+_CATEGORIES_CACHE = {'payload': None, 'etag': None}
+_CATEGORIES_SQL = text('SELECT id, name FROM categories ORDER BY id')
+
+# Summary payloads keyed by (user_id, expense version, start, end), each stored with
+# its expiry time. The version is read from the database, so a write handled by any
+# worker retires every worker's entries; expired ones are swept once the cache fills
+_SUMMARY_CACHE = {}
+_SUMMARY_CACHE_MAX_ENTRIES = 1024
+
+# Known category ids, filled by init_database so add_expense can usually skip a lookup
+_CATEGORY_IDS = set()
 
 # Initialize database tables and default categories
 def init_database():
     """Initialize database tables and default categories"""
-    db.create_all()
-    
-    # Create default categories if they don't exist
-    default_categories = [
-        'Food & Dining', 'Transportation', 'Shopping', 'Entertainment',
-        'Bills & Utilities', 'Health & Fitness', 'Travel', 'Education',
-        'Personal Care', 'Other'
-    ]
-    
-    for cat_name in default_categories:
-        if not Category.query.filter_by(name=cat_name).first():
-            category = Category(name=cat_name)
-            db.session.add(category)
+    # Schema, seed and backfill share one transaction: a cold start costs a single
+    # commit and a failed seed leaves no partial schema behind
+    with db.engine.begin() as conn:
+        if conn.dialect.name == 'sqlite':
+            # pysqlite runs DDL outside a transaction unless one was opened explicitly
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+        db.metadata.create_all(conn)
+        
+        # create_all skips existing tables, so add indexes introduced since they were created
+        for index in Expense.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        
+        # Seed the default categories in one statement the first time the table is empty;
+        # names that already exist are skipped by the unique constraint
+        if conn.execute(db.select(Category.id).limit(1)).first() is None:
+            rows = [{'name': cat_name} for cat_name in DEFAULT_CATEGORIES]
+            dialect_insert = upsert_insert()
+            if dialect_insert is not None:
+                conn.execute(dialect_insert(Category).values(rows).on_conflict_do_nothing(index_elements=['name']))
+            else:
+                conn.execute(insert(Category), rows)
+        
+        # Build the monthly rollup from existing expenses the first time it is empty
+        if conn.execute(db.select(MonthlySpending.user_id).limit(1)).first() is None:
+            conn.execute(monthly_rollup_insert())
+        
+        category_ids = conn.execute(db.select(Category.id)).scalars().all()
     
-    db.session.commit()
+    _CATEGORIES_CACHE['payload'] = None
+    _CATEGORIES_CACHE['etag'] = None
+    _CATEGORY_IDS.clear()
+    _CATEGORY_IDS.update(category_ids)
 
-# Initialize database when app starts
-with app.app_context():
-    try:
-        init_database()
-        
-        # Test database connection using proper SQLAlchemy 2.0 syntax
-        result = db.session.execute(text('SELECT 1 as test')).fetchone()
-        if result:
-            print('✅ Database connection test passed')
-    except Exception as e:
-        print(f'❌ Database initialization error: {e}')
+def monthly_rollup_insert():
+    """INSERT ... SELECT that builds monthly_spending rows from all expenses"""
+    year = cast(extract('year', Expense.date), Integer)
+    month = cast(extract('month', Expense.date), Integer)
+    return insert(MonthlySpending).from_select(
+        ['user_id', 'year', 'month', 'category_id', 'total'],
+        db.select(Expense.user_id, year, month, Expense.category_id, func.sum(Expense.amount))
+        .group_by(Expense.user_id, year, month, Expense.category_id)
+    )
+
+def query_monthly_expenses(filters):
+    """Return (year, month, total) rows grouped directly from the matching expenses"""
+    year = extract('year', Expense.date)
+    month = extract('month', Expense.date)
+    return (
+        db.session.query(year, month, func.sum(Expense.amount))
+        .filter(*filters)
+        .group_by(year, month)
+        .all()
+    )
+
+def query_monthly_rollup(user_id):
+    """Return (year, month, total) rows from the rollup, skipping months that net to zero"""
+    monthly_total = func.sum(MonthlySpending.total)
+    return (
+        db.session.query(MonthlySpending.year, MonthlySpending.month, monthly_total)
+        .filter(MonthlySpending.user_id == user_id)
+        .group_by(MonthlySpending.year, MonthlySpending.month)
+        .having(func.round(monthly_total, 2) != 0)
+        .all()
+    )
+
+def bump_expense_version(user_id):
+    """Increment the user's expense version within the current transaction"""
+    dialect_insert = upsert_insert()
+    if dialect_insert is not None:
+        stmt = dialect_insert(ExpenseVersion).values(user_id=user_id, version=1)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={'version': ExpenseVersion.version + 1}
+        ))
+    else:
+        row = db.session.get(ExpenseVersion, user_id)
+        if row is None:
+            db.session.add(ExpenseVersion(user_id=user_id, version=1))
+        else:
+            row.version += 1
+
+def store_summary(cache_key, payload):
+    """Cache a summary payload, sweeping expired entries when the cache is full"""
+    now = time.monotonic()
+    if len(_SUMMARY_CACHE) >= _SUMMARY_CACHE_MAX_ENTRIES:
+        for key, (expires_at, _) in list(_SUMMARY_CACHE.items()):
+            if expires_at <= now:
+                _SUMMARY_CACHE.pop(key, None)
+        if len(_SUMMARY_CACHE) >= _SUMMARY_CACHE_MAX_ENTRIES:
+            _SUMMARY_CACHE.clear()
+    _SUMMARY_CACHE[cache_key] = (now + app.config.get('SUMMARY_CACHE_TIMEOUT', 30), payload)
+
+def apply_monthly_delta(user_id, expense_date, category_id, delta):
+    """Add delta to the user's monthly rollup row within the current transaction"""
+    key = {
+        'user_id': user_id,
+        'year': expense_date.year,
+        'month': expense_date.month,
+        'category_id': category_id
+    }
+    dialect_insert = upsert_insert()
+    if dialect_insert is not None:
+        stmt = dialect_insert(MonthlySpending).values(total=delta, **key)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={'total': MonthlySpending.total + stmt.excluded.total}
+        ))
+    else:
+        row = db.session.get(MonthlySpending, tuple(key.values()))
+        if row is None:
+            db.session.add(MonthlySpending(total=delta, **key))
+        else:
+            row.total += Decimal(str(delta))
+
+# Initialize the database lazily on the first request rather than at import,
+# so worker boot does not wait on a database round-trip
+_database_initialized = False
+_database_init_lock = threading.Lock()
+
+@app.before_request
+def ensure_database():
+    """Run init_database once per process before the first request"""
+    global _database_initialized
+    if _database_initialized:
+        return
+    with _database_init_lock:
+        if _database_initialized:
+            return
+        try:
+            init_database()
+            _database_initialized = True
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f'Database initialization error: {e}')
+
+@app.before_request
+def reject_oversized_body():
+    """Reject bodies over MAX_CONTENT_LENGTH before a view tries to parse them"""
+    max_length = app.config.get('MAX_CONTENT_LENGTH')
+    if max_length and request.content_length and request.content_length > max_length:
+        return jsonify({'error': 'Request body too large'}), 413
+
+_AUTH_REQUIRED_ERROR = {'error': 'Authentication required'}
 
 def login_required(f):
-    """Decorator to require login for protected routes"""
+    """Decorator to require login for protected routes; passes user_id to the view"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return jsonify({'error': 'Authentication required'}), 401
-        return f(*args, **kwargs)
+        user_id = session.get('user_id')
+        if user_id is None:
+            return jsonify(_AUTH_REQUIRED_ERROR), 401
+        return f(*args, user_id=user_id, **kwargs)
     return decorated_function
 
+def parse_date(value):
+    """Parse an ISO date string, taking the fast path for plain YYYY-MM-DD values"""
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value).date()
+
+_EXPENSE_REQUIRED_FIELDS = ('description', 'amount', 'category_id')
+
+# Scale of Expense.amount; values are normalized to it before they are stored or echoed
+_CENT = Decimal('0.01')
+
 def validate_expense_data(data):
-    """Validate expense data"""
-    required_fields = ['description', 'amount', 'category_id']
-    for field in required_fields:
-        if field not in data or not data[field]:
-            return False, f'Missing required field: {field}'
+    """Validate expense data in one pass, returning (amount, category_id, error_message)"""
+    if not isinstance(data, dict):
+        return None, None, 'Invalid request body'
+    
+    for field in _EXPENSE_REQUIRED_FIELDS:
+        if not data.get(field):
+            return None, None, f'Missing required field: {field}'
     
+    # Parse to Decimal so the value binds to the NUMERIC column without float rounding
     try:
-        amount = float(data['amount'])
-        if amount <= 0:
-            return False, 'Amount must be positive'
-    except ValueError:
-        return False, 'Invalid amount format'
+        amount = Decimal(str(data['amount']))
+    except InvalidOperation:
+        return None, None, 'Invalid amount format'
+    
+    if not amount.is_finite():
+        return None, None, 'Invalid amount format'
+    
+    if amount <= 0:
+        return None, None, 'Amount must be positive'
     
-    return True, None
+    # The column holds cents; finer values would be rounded differently by each backend
+    if amount.as_tuple().exponent < -2:
+        return None, None, 'Amount can have at most 2 decimal places'
+    
+    # bool is an int subclass, but true is not a category id
+    category_id = data['category_id']
+    if type(category_id) is not int:
+        return None, None, 'Invalid category'
+    
+    return amount, category_id, None
 
 @app.route('/')
 def index():
@@ -113,7 +372,9 @@ def register():
         # Create new user
         user = User(
             username=username,
-            password_hash=generate_password_hash(password)
+            password_hash=generate_password_hash(
+                password, method=app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+            )
         )
         
         db.session.add(user)
@@ -157,63 +418,88 @@ def login():
 
 @app.route('/api/logout', methods=['POST'])
 @login_required
-def logout():
+def logout(user_id):
     """User logout endpoint"""
     username = session.get('username')
     session.clear()
     logging.info(f'User logged out: {username}')
     return jsonify({'message': 'Logged out successfully'}), 200
 
+@app.route('/api/auth/status', methods=['GET'])
+def auth_status():
+    """Report the logged-in user from the session, without a database lookup"""
+    user_id = session.get('user_id')
+    if user_id is None:
+        return jsonify({'authenticated': False}), 200
+    return jsonify({
+        'authenticated': True,
+        'user': {'id': user_id, 'username': session.get('username')}
+    }), 200
+
 @app.route('/api/categories', methods=['GET'])
 @login_required
-def get_categories():
+def get_categories(user_id):
     """Get all expense categories"""
     try:
-        categories = Category.query.all()
-        return jsonify([{
-            'id': cat.id,
-            'name': cat.name
-        } for cat in categories]), 200
+        payload = _CATEGORIES_CACHE['payload']
+        etag = _CATEGORIES_CACHE['etag']
+        if payload is None or etag is None:
+            rows = db.session.execute(_CATEGORIES_SQL).fetchall()
+            payload = [{'id': row[0], 'name': row[1]} for row in rows]
+            etag = hashlib.blake2b(orjson.dumps(payload), digest_size=8).hexdigest()
+            _CATEGORIES_CACHE['payload'] = payload
+            _CATEGORIES_CACHE['etag'] = etag
+        
+        # Let clients revalidate with If-None-Match and get a 304 when unchanged
+        response = jsonify(payload)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         logging.error(f'Get categories error: {str(e)}')
         return jsonify({'error': 'Failed to fetch categories'}), 500
 
 @app.route('/api/expenses', methods=['GET'])
 @login_required
-def get_expenses():
+def get_expenses(user_id):
     """Get user expenses with optional filtering"""
     try:
-        user_id = session['user_id']
-        
         # Get query parameters
         category_id = request.args.get('category_id', type=int)
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         limit = request.args.get('limit', 50, type=int)
         
-        # Build query
-        query = Expense.query.filter_by(user_id=user_id)
+        # Build query over plain columns, joining the category name in the same SELECT;
+        # the column order matches ExpenseRow
+        query = (
+            db.session.query(
+                Expense.id,
+                Expense.description,
+                Expense.amount,
+                Category.name.label('category'),
+                Expense.category_id,
+                Expense.date,
+                Expense.created_at
+            )
+            .join(Category)
+            .filter(Expense.user_id == user_id)
+        )
         
         if category_id:
-            query = query.filter_by(category_id=category_id)
+            query = query.filter(Expense.category_id == category_id)
         
         if start_date:
-            query = query.filter(Expense.date >= datetime.fromisoformat(start_date))
+            query = query.filter(Expense.date >= parse_date(start_date))
         
         if end_date:
-            query = query.filter(Expense.date <= datetime.fromisoformat(end_date))
+            query = query.filter(Expense.date <= parse_date(end_date))
         
-        expenses = query.order_by(Expense.date.desc()).limit(limit).all()
+        rows = query.order_by(Expense.date.desc()).limit(limit).all()
         
-        return jsonify([{
-            'id': exp.id,
-            'description': exp.description,
-            'amount': float(exp.amount),
-            'category': exp.category.name,
-            'category_id': exp.category_id,
-            'date': exp.date.isoformat(),
-            'created_at': exp.created_at.isoformat()
-        } for exp in expenses]), 200
+        # Dataclass, Decimal and date values are serialized by ORJSONProvider
+        return jsonify([ExpenseRow(*row) for row in rows]), 200
         
     except Exception as e:
         logging.error(f'Get expenses error: {str(e)}')
@@ -221,44 +507,52 @@ def get_expenses():
 
 @app.route('/api/expenses', methods=['POST'])
 @login_required
-def add_expense():
+def add_expense(user_id):
     """Add a new expense"""
     try:
         data = request.get_json()
         
         # Validate input
-        is_valid, error_msg = validate_expense_data(data)
-        if not is_valid:
+        amount, category_id, error_msg = validate_expense_data(data)
+        if error_msg:
             return jsonify({'error': error_msg}), 400
         
-        # Check if category exists
-        category = Category.query.get(data['category_id'])
-        if not category:
-            return jsonify({'error': 'Invalid category'}), 400
+        # Check if category exists, only hitting the database for unknown ids
+        if category_id not in _CATEGORY_IDS:
+            if db.session.get(Category, category_id) is None:
+                return jsonify({'error': 'Invalid category'}), 400
+            _CATEGORY_IDS.add(category_id)
         
         # Create expense
         expense = Expense(
-            user_id=session['user_id'],
+            user_id=user_id,
             description=data['description'].strip(),
-            amount=float(data['amount']),
-            category_id=data['category_id'],
-            date=datetime.fromisoformat(data.get('date', datetime.now().isoformat()))
+            amount=amount.quantize(_CENT),
+            category_id=category_id,
+            date=parse_date(data['date']) if data.get('date') else date.today()
         )
         
         db.session.add(expense)
-        db.session.commit()
+        db.session.flush()
+        apply_monthly_delta(user_id, expense.date, expense.category_id, expense.amount)
+        bump_expense_version(user_id)
         
-        logging.info(f'Expense added: {expense.description} - ${expense.amount}')
-        
-        return jsonify({
+        # Serialize before commit; commit expires the instance and reading it
+        # afterwards would reload the row
+        payload = {
             'id': expense.id,
             'description': expense.description,
-            'amount': float(expense.amount),
+            'amount': expense.amount,
             'category': expense.category.name,
             'category_id': expense.category_id,
-            'date': expense.date.isoformat(),
-            'created_at': expense.created_at.isoformat()
-        }), 201
+            'date': expense.date,
+            'created_at': expense.created_at
+        }
+        db.session.commit()
+        
+        logging.info(f"Expense added: {payload['description']} - ${payload['amount']:.2f}")
+        
+        return jsonify(payload), 201
         
     except Exception as e:
         logging.error(f'Add expense error: {str(e)}')
@@ -266,18 +560,21 @@ def add_expense():
 
 @app.route('/api/expenses/<int:expense_id>', methods=['DELETE'])
 @login_required
-def delete_expense(expense_id):
+def delete_expense(expense_id, user_id):
     """Delete an expense"""
     try:
-        expense = Expense.query.filter_by(
-            id=expense_id, 
-            user_id=session['user_id']
+        # Delete in one statement, scoped to the owner, returning what the rollup needs
+        expense = db.session.execute(
+            delete(Expense)
+            .where(Expense.id == expense_id, Expense.user_id == user_id)
+            .returning(Expense.description, Expense.date, Expense.category_id, Expense.amount)
         ).first()
         
         if not expense:
             return jsonify({'error': 'Expense not found'}), 404
         
-        db.session.delete(expense)
+        apply_monthly_delta(user_id, expense.date, expense.category_id, -expense.amount)
+        bump_expense_version(user_id)
         db.session.commit()
         
         logging.info(f'Expense deleted: {expense.description}')
@@ -289,48 +586,75 @@ def delete_expense(expense_id):
 
 @app.route('/api/summary', methods=['GET'])
 @login_required
-def get_summary():
+def get_summary(user_id):
     """Get expense summary and analytics"""
     try:
-        user_id = session['user_id']
-        
         # Get date range
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-        
-        # Build base query
-        query = Expense.query.filter_by(user_id=user_id)
-        
-        if start_date:
-            query = query.filter(Expense.date >= datetime.fromisoformat(start_date))
-        if end_date:
-            query = query.filter(Expense.date <= datetime.fromisoformat(end_date))
-        
-        expenses = query.all()
-        
-        # Calculate totals
-        total_amount = sum(exp.amount for exp in expenses)
-        total_count = len(expenses)
-        
-        # Category breakdown
+        start = parse_date(start_date) if start_date else None
+        end = parse_date(end_date) if end_date else None
+        
+        # Serve a recent result for the same range if no expense was written since
+        version = db.session.scalar(
+            db.select(ExpenseVersion.version).where(ExpenseVersion.user_id == user_id)
+        ) or 0
+        cache_key = (user_id, version, start, end)
+        cached = _SUMMARY_CACHE.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return jsonify(cached[1]), 200
+        
+        # Build base filters
+        filters = [Expense.user_id == user_id]
+        
+        if start:
+            filters.append(Expense.date >= start)
+        if end:
+            filters.append(Expense.date <= end)
+        
+        # Category breakdown, aggregated by the database; the overall totals are
+        # folded from these few grouped rows rather than a separate query
+        category_rows = (
+            db.session.query(Category.name, func.sum(Expense.amount), func.count(Expense.id))
+            .join(Expense)
+            .filter(*filters)
+            .group_by(Category.name)
+            .all()
+        )
         category_totals = {}
-        for expense in expenses:
-            cat_name = expense.category.name
-            category_totals[cat_name] = category_totals.get(cat_name, 0) + float(expense.amount)
-        
-        # Monthly breakdown (last 12 months)
-        monthly_totals = {}
-        for expense in expenses:
-            month_key = expense.date.strftime('%Y-%m')
-            monthly_totals[month_key] = monthly_totals.get(month_key, 0) + float(expense.amount)
-        
-        return jsonify({
+        total_amount = 0
+        total_count = 0
+        for name, amount, count in category_rows:
+            category_totals[name] = float(amount)
+            total_amount += amount
+            total_count += count
+        
+        # Monthly breakdown; without a date range it is read from the rollup table
+        if start or end:
+            monthly_rows = query_monthly_expenses(filters)
+        else:
+            monthly_rows = query_monthly_rollup(user_id)
+            
+            # Expenses written outside add_expense/delete_expense bypass the rollup, and a
+            # write committed between the two reads also shows up here; either way the
+            # expenses themselves are grouped instead, and the rollup is left untouched
+            if round(sum(total for _, _, total in monthly_rows), 2) != round(total_amount, 2):
+                logging.warning(f'Monthly rollup disagrees with expenses for user {user_id}')
+                monthly_rows = query_monthly_expenses(filters)
+        monthly_totals = {
+            f'{int(y):04d}-{int(m):02d}': float(total) for y, m, total in monthly_rows
+        }
+        
+        payload = {
             'total_amount': float(total_amount),
             'total_count': total_count,
             'category_breakdown': category_totals,
             'monthly_breakdown': monthly_totals,
-            'average_per_expense': float(total_amount / max(total_count, 1))
-        }), 200
+            'average_per_expense': float(total_amount / total_count) if total_count else 0.0
+        }
+        store_summary(cache_key, payload)
+        
+        return jsonify(payload), 200
         
     except Exception as e:
         logging.error(f'Get summary error: {str(e)}')
@@ -0,0 +1,16 @@
+"""
+Personal Finance Manager - Gunicorn Configuration
+Picked up automatically by `gunicorn controller:app`
+"""
+
+from settings import settings
+
+# Cooperative workers: requests waiting on the database yield to other requests
+worker_class = 'gevent'
+workers = settings.web_concurrency
+worker_connections = 1000
+
+def post_fork(server, worker):
+    """Make psycopg2 wait cooperatively under gevent"""
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
@@ -1,13 +1,39 @@
 """
 Personal Finance Manager - Database Models
-SQLAlchemy models for User, Expense, and Category
+SQLAlchemy models for User, Expense, Category, MonthlySpending, and ExpenseVersion
 """
 
-from datetime import datetime
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
+# Applied to every new SQLite connection: WAL lets readers run alongside a writer,
+# and synchronous=NORMAL is durable in WAL mode without an fsync per commit
+_SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA foreign_keys=ON'
+)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite connections; other databases are left untouched"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 class User(db.Model):
     """User model for authentication"""
     __tablename__ = 'users'
@@ -19,6 +45,8 @@ class User(db.Model):
 
     # Relationship with expenses
     expenses = db.relationship('Expense', backref='user', lazy=True, cascade='all, delete-orphan')
+    monthly_spending = db.relationship('MonthlySpending', lazy=True, cascade='all, delete-orphan')
+    expense_version = db.relationship('ExpenseVersion', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<User {self.username}>'
@@ -31,8 +59,9 @@ class Category(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Relationship with expenses
-    expenses = db.relationship('Expense', backref='category', lazy=True)
+    # Relationship with expenses; Expense.category is joined in whenever expenses
+    # are loaded, so serializing a list does not issue a query per row
+    expenses = db.relationship('Expense', backref=db.backref('category', lazy='joined'), lazy=True)
 
     def __repr__(self):
         return f'<Category {self.name}>'
@@ -40,9 +69,17 @@ class Category(db.Model):
 class Expense(db.Model):
     """Expense model for financial transactions"""
     __tablename__ = 'expenses'
+    __table_args__ = (
+        # Composite indexes for the per-user listing and summary queries; on
+        # PostgreSQL the first one also covers the summary aggregates. Its
+        # user_id prefix serves user_id-only lookups, so that column has no index of its own
+        db.Index('ix_expenses_user_date', 'user_id', 'date',
+                 postgresql_include=['amount', 'category_id']),
+        db.Index('ix_expenses_user_category_date', 'user_id', 'category_id', 'date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
     description = db.Column(db.String(255), nullable=False)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
@@ -64,3 +101,41 @@ class Expense(db.Model):
             'date': self.date.isoformat(),
             'created_at': self.created_at.isoformat()
         }
+
+class MonthlySpending(db.Model):
+    """Per-user monthly expense totals by category, kept in step with Expense writes
+
+    Every write to expenses must apply the matching delta here in the same
+    transaction; the summary endpoint falls back to grouping expenses if they disagree.
+    """
+    __tablename__ = 'monthly_spending'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), primary_key=True)
+    total = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<MonthlySpending {self.user_id} {self.year}-{self.month:02d}: ${self.total}>'
+
+class ExpenseVersion(db.Model):
+    """Per-user counter bumped with every expense write, used to key cached summaries"""
+    __tablename__ = 'expense_versions'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ExpenseVersion {self.user_id}: {self.version}>'
+
+@dataclass(slots=True)
+class ExpenseRow:
+    """Lightweight expense listing row, built from a column SELECT and serialized by orjson"""
+    id: int
+    description: str
+    amount: Decimal
+    category: str
+    category_id: int
+    date: date
+    created_at: datetime
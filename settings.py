@@ -0,0 +1,37 @@
+"""
+Personal Finance Manager - Settings
+Environment-derived settings, read once per process
+"""
+
+import os
+from dataclasses import dataclass
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable snapshot of the environment variables the app uses"""
+    secret_key: str | None
+    flask_env: str | None
+    database_url: str
+    log_level: str
+    web_concurrency: int
+    redis_url: str | None
+
+    @property
+    def is_postgres(self):
+        """Whether DATABASE_URL points at PostgreSQL"""
+        return self.database_url.startswith(('postgres://', 'postgresql://'))
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Build settings from an environment mapping"""
+        return cls(
+            secret_key=environ.get('SECRET_KEY'),
+            flask_env=environ.get('FLASK_ENV'),
+            database_url=(environ.get('DATABASE_URL') or '').strip(),
+            log_level=environ.get('LOG_LEVEL', 'INFO'),
+            web_concurrency=max(int(environ.get('WEB_CONCURRENCY') or 2), 1),
+            redis_url=environ.get('REDIS_URL') or None
+        )
+
+# Process-wide settings instance
+settings = Settings.from_env()
@@ -67,7 +67,11 @@ class FinanceApp {
 
     async checkAuth() {
         try {
-            await Utils.apiCall('/api/expenses?limit=1');
+            const status = await Utils.apiCall('/api/auth/status');
+            if (!status.authenticated) {
+                throw new Error('Not authenticated');
+            }
+            this.currentUser = status.user;
             await this.loadInitialData();
             this.showApp();
         } catch (error) {
@@ -366,8 +370,10 @@ class FinanceApp {
             document.getElementById('expenseForm').reset();
             this.setDefaultDate();
             
-            await this.loadExpenses();
-            await this.loadSummary();
+            await Promise.all([
+                this.loadExpenses(),
+                this.loadSummary()
+            ]);
             
             this.showToast('Expense added successfully!', 'success');
         } catch (error) {
@@ -387,8 +393,10 @@ class FinanceApp {
                 method: 'DELETE' 
             });
             
-            await this.loadExpenses();
-            await this.loadSummary();
+            await Promise.all([
+                this.loadExpenses(),
+                this.loadSummary()
+            ]);
             
             this.showToast('Expense deleted successfully!', 'success');
         } catch (error) {